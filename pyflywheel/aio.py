@@ -0,0 +1,327 @@
+"""
+飞轮控制异步模块，基于 asyncio 与 pyserial-asyncio
+"""
+import asyncio
+import concurrent.futures
+import inspect
+import logging
+import time
+import zlib
+from collections import deque
+from typing import Callable, Optional
+
+import serial
+import serial_asyncio
+
+from .core import CallbackEvent, TelemetryBuffer, _FlyWheelBase
+
+
+class AsyncFlyWheel(_FlyWheelBase):
+    """
+    异步飞轮控制类，通信、接收、轮询均为同一事件循环中的协程，
+    不再需要线程与线程安全队列
+    """
+    # 其他线程向事件循环转交命令时等待的最长时间，单位秒
+    _HANDOFF_TIMEOUT = 1.0
+    # 待执行回调事件的上限
+    _CALLBACK_QUEUE_SIZE = 64
+
+    def __init__(self, port: str, baudrate: int, inertia: float = 0.001608,
+                 queue_size: int = 1000, callback: Callable[[CallbackEvent], None] = None,
+                 max_telemetry_size: int = 1000, auto_polling: bool = False,
+                 polling_frequency: float = 100.0, poll_interval: Optional[float] = None):
+        """
+        初始化飞轮参数，串口在 connect() 中打开
+
+        Args:
+            port: RS232端口名称
+            baudrate: 波特率
+            queue_size: 命令队列大小
+            callback: 回调函数，在事件循环中被调用，可以是协程函数
+            max_telemetry_size: 遥测数据最大存储数量
+            auto_polling: 是否自动开启轮询协程
+            polling_frequency: 轮询频率，单位Hz
+            poll_interval: 串口读写的轮询间隔，单位秒，仅 Windows 下生效；
+                为空时取8个字节的传输时间
+        """
+        self.inertia = inertia
+
+        self.port = port
+        self.baudrate = baudrate
+        # 每字节10位(起始位、8位数据、停止位)
+        self.poll_interval = poll_interval if poll_interval is not None else 80.0 / baudrate
+
+        self.logger = logging.getLogger(__name__)
+
+        # 队列需在事件循环中创建，见 connect()
+        self._queue_size = queue_size
+        self.cmd_queue: Optional[asyncio.Queue] = None
+
+        self._polling_frequency = polling_frequency
+        self.auto_polling = auto_polling
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._tasks = []
+
+        self._running = False
+        self._is_connected = False
+
+        self.callback = callback
+        # 回调事件通道：接收协程只登记事件，由回调协程按顺序调用回调，
+        # 回调中的等待不会阻塞接收；事件需在事件循环中创建，见 connect()
+        self._callback_events = deque(maxlen=self._CALLBACK_QUEUE_SIZE)
+        self._callback_event: Optional[asyncio.Event] = None
+        self.telemetry = TelemetryBuffer(max_telemetry_size)
+        self._reset_clock()
+
+    async def connect(self) -> bool:
+        """
+        打开串口并建立异步读写流
+
+        Returns:
+            bool: 是否成功连接
+        """
+        if self._is_connected:
+            self.logger.warning("飞轮已连接")
+            return True
+
+        try:
+            self._reader, self._writer = await serial_asyncio.open_serial_connection(
+                url=self.port,
+                baudrate=self.baudrate,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE
+            )
+            # Windows 下 pyserial-asyncio 以定时轮询代替选择器，默认间隔固定为 0.5 ms，
+            # 按波特率调整后低速时不再空转，高速时也不会积压
+            transport = self._writer.transport
+            if hasattr(transport, '_poll_wait_time'):
+                transport._poll_wait_time = self.poll_interval
+            else:
+                self.logger.debug("串口传输不支持设置轮询间隔: %s", type(transport).__name__)
+            self.cmd_queue = asyncio.Queue(maxsize=self._queue_size)
+            self._callback_event = asyncio.Event()
+            self._loop = asyncio.get_running_loop()
+            self._is_connected = True
+            return True
+        except serial.SerialException as e:
+            self.logger.error("串口连接失败: %s", e)
+            self._is_connected = False
+            return False
+
+    async def start(self) -> bool:
+        """
+        启动通信、接收、回调及轮询协程
+        """
+        if self._running:
+            self.logger.warning("飞轮已启动")
+            return False
+
+        self._running = True
+        self._reset_clock()
+        self._tasks = [
+            asyncio.ensure_future(self._communication_loop()),
+            asyncio.ensure_future(self._response_loop()),
+            asyncio.ensure_future(self._callback_loop()),
+        ]
+        if self.auto_polling:
+            self._tasks.append(asyncio.ensure_future(self._polling_loop()))
+
+        return True
+
+    async def stop(self):
+        """
+        停止所有协程
+        """
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def disconnect(self):
+        """
+        断开与飞轮的连接
+        """
+        await self.stop()
+
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+        self._is_connected = False
+
+    async def _communication_loop(self) -> None:
+        """
+        通信协程，从队列取出命令并写入串口
+        """
+        while self._running:
+            command = await self.cmd_queue.get()
+            try:
+                self._writer.write(command)
+                await self._writer.drain()
+            except Exception as e:
+                self.logger.exception("通信循环错误: %s", e)
+
+    async def _response_loop(self) -> None:
+        """
+        接收协程，按帧头定位后一次读取完整帧
+        """
+        while self._running:
+            try:
+                # 丢弃帧头之前的字节
+                await self._reader.readuntil(self._FRAME_HEADER)
+                frame_type = await self._reader.readexactly(1)
+                expected_length = 32 if frame_type[0] == 0xDD else 8
+                frame = self._FRAME_HEADER + frame_type + await self._reader.readexactly(expected_length - 3)
+            except asyncio.LimitOverrunError as e:
+                # 长时间未出现帧头，丢弃已缓存的数据
+                await self._reader.readexactly(e.consumed)
+                continue
+            except asyncio.IncompleteReadError:
+                self.logger.error("串口已关闭")
+                break
+
+            # adler32 的低16位即为字节和，见 FlyWheel._rx_parse
+            checksum = zlib.adler32(frame[2:-1], 0) & 0xFF
+            if checksum != frame[-1]:
+                self.logger.warning("遥测数据校验和错误: %s", frame.hex(' ').upper())
+                continue
+
+            if expected_length == 32:
+                try:
+                    self.telemetry.append_frame(self._timestamp(), frame)
+                    if self.callback:
+                        self._callback_events.append(CallbackEvent.RECV_TELE_DATA)
+                        self._callback_event.set()
+                except Exception as e:
+                    self.logger.error("处理遥测数据错误: %s", e)
+            elif self.logger.isEnabledFor(logging.DEBUG):
+                # 应答随每条命令出现，未开启 DEBUG 时不生成十六进制字符串
+                self.logger.debug("收到8字节响应: %s", frame.hex())
+
+    async def _callback_loop(self) -> None:
+        """
+        回调协程，按接收顺序逐个调用回调函数，协程回调在此等待完成
+        """
+        events = self._callback_events
+
+        while self._running:
+            if not events:
+                self._callback_event.clear()
+                await self._callback_event.wait()
+                continue
+
+            event = events.popleft()
+            callback = self.callback
+            if callback is None:
+                continue
+            try:
+                result = callback(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                self.logger.exception("回调函数错误: %s", e)
+
+    async def _polling_loop(self) -> None:
+        """
+        轮询协程，按绝对时间点调度以避免漂移
+        """
+        period = 1.0 / self._polling_frequency
+        next_time = time.perf_counter() + period
+
+        while self._running:
+            try:
+                self.poll_status()
+            except Exception as e:
+                self.logger.error("轮询过程发生错误: %s", e)
+
+            # 超时时以当前时间重新对齐，避免连续补发
+            now = time.perf_counter()
+            if next_time > now:
+                await asyncio.sleep(next_time - now)
+            else:
+                next_time = now
+                await asyncio.sleep(0)
+            next_time += period
+
+    def _send_command(self, command: bytes) -> bool:
+        """
+        发送命令到队列；事件循环运行于其他线程时转交事件循环执行，
+        便于同步代码在事件循环运行于独立线程时直接调用 set_speed 等方法。
+        事件循环未运行时直接放入队列
+
+        Args:
+            command: 要发送的命令字节序列
+
+        Returns:
+            bool: 是否成功发送
+        """
+        if self.cmd_queue is None:
+            self.logger.error("飞轮未连接")
+            return False
+
+        loop = self._loop
+        if loop.is_closed():
+            self.logger.error("事件循环已关闭")
+            return False
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        # 事件循环正在运行且不在当前线程，只能由事件循环线程操作队列
+        if loop.is_running() and running_loop is not loop:
+            return self._handoff_command(loop, command)
+
+        return self._put_command(command)
+
+    def _handoff_command(self, loop: asyncio.AbstractEventLoop, command: bytes) -> bool:
+        """
+        将命令转交运行于其他线程的事件循环放入队列。入队前先将 future 置为运行状态，
+        与超时后的 cancel() 互斥：取消成功则命令确定未入队，否则入队已开始，等待其结果
+
+        Args:
+            loop: 事件循环
+            command: 要发送的命令字节序列
+
+        Returns:
+            bool: 是否成功放入队列
+        """
+        future = concurrent.futures.Future()
+
+        def put():
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self._put_command(command))
+                except Exception as e:
+                    future.set_exception(e)
+
+        loop.call_soon_threadsafe(put)
+        try:
+            return future.result(timeout=self._HANDOFF_TIMEOUT)
+        except concurrent.futures.TimeoutError:
+            if future.cancel():
+                self.logger.error("事件循环未及时响应，命令未发送")
+                return False
+            return future.result()
+
+    def _put_command(self, command: bytes) -> bool:
+        """
+        将命令放入队列，只能在事件循环中调用
+
+        Args:
+            command: 要发送的命令字节序列
+
+        Returns:
+            bool: 是否成功放入队列
+        """
+        try:
+            self.cmd_queue.put_nowait(command)
+            return True
+        except asyncio.QueueFull:
+            self.logger.error("命令队列已满")
+            return False
@@ -1,17 +1,28 @@
 """
 飞轮控制核心模块
 """
+from array import array
 from collections import deque
+import ctypes
+from functools import lru_cache
+from operator import attrgetter
 import serial
+import sys
 import time
 import struct
 import threading
-from typing import Callable, Optional
-from queue import Queue, Empty, Full
+import warnings
+from typing import Callable, NamedTuple, Optional
 import logging
 import json
-from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor
+import csv
+import zlib
+
+
+_tuple_new = tuple.__new__
+
+# 单字节到 '0xXX' 字符串的查找表
+_HEX_BYTE = tuple(f'0x{i:02X}' for i in range(256))
 
 
 class CallbackEvent:
@@ -21,14 +32,14 @@ class CallbackEvent:
     RECV_TELE_DATA = 1
 
 
-@dataclass
-class TelemetryData:
+class TelemetryData(NamedTuple):
     """
     遥测数据类，用于封装飞轮的遥测数据
+
+    数值字段在解析时解包，帧头、上条命令与保留字段的十六进制字符串
+    仅在访问时由原始帧生成
     """
     timestamp: float
-    header: str
-    last_command: str
     control_target: float
     flywheel_speed_feedback: float
     flywheel_current_feedback: float
@@ -39,181 +50,255 @@ class TelemetryData:
     motherboard_current: int
     temperature: int
     single_motor_status: int
-    reserved: str
     checksum: int
-
-    def print_telemetry(self):
-        print(f"timestamp: {self.timestamp}")
-        print(f"header: {self.header}")
-        print(f"last_command: {self.last_command}")
-        print(f"control_target: {self.control_target}")
-        print(f"flywheel_speed_feedback(rpm): {self.flywheel_speed_feedback}")
-        print(f"flywheel_current_feedback(mA): {self.flywheel_current_feedback}")
-        print(f"acceleration_feedback: {self.acceleration_feedback}")
-        print(f"command_response_count: {self.command_response_count}")
-        print(f"telemetry_wheel_command_count: {self.telemetry_wheel_command_count}")
-        print(f"error_command_count: {self.error_command_count}")
-        print(f"motherboard_current(mA): {self.motherboard_current}")
-        print(f"temperature(C): {self.temperature}")
-        print(f"single_motor_status: {self.single_motor_status}")
-        print(f"reserved: {self.reserved}")
-        print(f"checksum: {self.checksum}")
-
-
-class FlyWheel:
-    """
-    飞轮控制类，负责与飞轮硬件通过RS232进行通信
-    """
-    def __init__(self, port: str, baudrate: int, timeout: Optional[int] = None, inertia: float = 0.001608,
-                 queue_size: int = 1000, communication_frequency: int = 200,
-                 callback: Callable[[CallbackEvent], None] = None, max_telemetry_size: int = 1000,
-                 auto_polling: bool = False, polling_frequency: float = 100.0, rtx_buffer_size: int = 4096,
-                 max_thread_poll_workers=2):
+    raw: bytes
+
+    # 遥测帧第4~31字节: 4个float, 3个u8计数, u16主板电流, i8温度, u8电机状态, 4字节保留(跳过), u8校验和
+    _STRUCT = struct.Struct('>4f3BHbB4xB')
+
+    # 导出字段及顺序
+    EXPORT_FIELDS = (
+        'timestamp', 'header', 'last_command', 'control_target', 'flywheel_speed_feedback',
+        'flywheel_current_feedback', 'acceleration_feedback', 'command_response_count',
+        'telemetry_wheel_command_count', 'error_command_count', 'motherboard_current',
+        'temperature', 'single_motor_status', 'reserved', 'checksum'
+    )
+    # 一次取出全部导出字段，省去逐个 getattr 的生成器开销
+    _EXPORT_GETTER = attrgetter(*EXPORT_FIELDS)
+
+    @classmethod
+    def from_frame(cls, timestamp: float, frame: bytes) -> 'TelemetryData':
         """
-        初始化飞轮连接
+        由32字节遥测帧构造遥测数据
 
         Args:
-            port: RS232端口名称
-            baudrate: 波特率
-            timeout: 串口超时时间
-            queue_size: 通信队列大小
-            communication_frequency: 通信线程频率
-            callback: 回调函数,接收遥测数据字典,可用于实时控制转速
-            max_telemetry_size: 遥测数据最大存储数量
-            auto_polling: 是否自动开启轮询线程
-            polling_frequency: 轮询频率，单位Hz
+            timestamp: 时间戳
+            frame: 32字节的原始数据
         """
-        self.inertia = inertia
+        # 数值字段与校验和的顺序与 _STRUCT 一致；字段数固定，直接调用 tuple.__new__
+        # 跳过 NamedTuple 生成的 Python 层 __new__，解析耗时约减少四成
+        return _tuple_new(cls, (timestamp, *cls._STRUCT.unpack_from(frame, 4), bytes(frame)))
+
+    @property
+    def header(self) -> str:
+        # 经帧同步的遥测帧帧头恒为 EB 90 DD，直接返回常量
+        if self.raw.startswith(b'\xEB\x90\xDD'):
+            return '0xEB 90 DD'
+        return '0x' + self.raw[0:3].hex(' ').upper()
+
+    @property
+    def last_command(self) -> str:
+        return _HEX_BYTE[self.raw[3]]
+
+    @property
+    def reserved(self) -> str:
+        return self.raw[27:31].hex()
+
+    def __getitem__(self, key):
+        """
+        兼容旧版字典形式的遥测数据，支持 telemetry['flywheel_speed_feedback'] 的写法；
+        整数索引与切片仍按元组处理
+        """
+        if isinstance(key, str):
+            if key not in self.EXPORT_FIELDS:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
 
-        self.port = port
-        self.baudrate = baudrate
-        self.timeout = timeout
+    def to_row(self) -> tuple:
+        """
+        按 EXPORT_FIELDS 顺序返回字段值
+        """
+        return self._EXPORT_GETTER(self)
 
-        self.logger = logging.getLogger(__name__)
+    def to_dict(self) -> dict:
+        """
+        返回可JSON序列化的字段字典
+        """
+        return dict(zip(self.EXPORT_FIELDS, self.to_row()))
 
-        self.cmd_queue = Queue(maxsize=queue_size)
-        self.resp_queue = Queue(maxsize=queue_size)
+    def print_telemetry(self):
+        # 一次性输出，避免逐行 print 反复获取 stdout 锁
+        print(
+            f"timestamp: {self.timestamp}\n"
+            f"header: {self.header}\n"
+            f"last_command: {self.last_command}\n"
+            f"control_target: {self.control_target}\n"
+            f"flywheel_speed_feedback(rpm): {self.flywheel_speed_feedback}\n"
+            f"flywheel_current_feedback(mA): {self.flywheel_current_feedback}\n"
+            f"acceleration_feedback: {self.acceleration_feedback}\n"
+            f"command_response_count: {self.command_response_count}\n"
+            f"telemetry_wheel_command_count: {self.telemetry_wheel_command_count}\n"
+            f"error_command_count: {self.error_command_count}\n"
+            f"motherboard_current(mA): {self.motherboard_current}\n"
+            f"temperature(C): {self.temperature}\n"
+            f"single_motor_status: {self.single_motor_status}\n"
+            f"reserved: {self.reserved}\n"
+            f"checksum: {self.checksum}"
+        )
 
-        self._communication_frequency = communication_frequency
-        self._polling_frequency = polling_frequency
 
-        self._comm_thread = None
-        self._polling_thread = None
-        self._resp_thread = None
-        self._proc_resp_thread = None
+class TelemetryBuffer:
+    """
+    遥测数据环形缓冲区
 
-        self.auto_polling = auto_polling
+    预分配存储原始32字节帧与时间戳，接收时只拷贝字节，读取时再解析为 TelemetryData；
+    提供与 deque 相同的 len、索引、迭代与 maxlen 接口
+    """
+    FRAME_SIZE = 32
+    # 整帧解包格式，跳过帧头与命令码，字段顺序与 TelemetryData 一致
+    _FRAME_STRUCT = struct.Struct('>4x4f3BHbB4xB')
 
-        self._polling = False
-        self._running = False
-        self._is_connected = False
+    def __init__(self, maxlen: int):
+        """
+        Args:
+            maxlen: 最大存储数量，写满后覆盖最旧的数据
+        """
+        self.maxlen = maxlen
+        self._frames = bytearray(maxlen * self.FRAME_SIZE)
+        self._view = memoryview(self._frames)
+        self._timestamps = array('d', bytes(8 * maxlen))
+        self._next = 0  # 下一个写入位置
+        self._count = 0
+        self._latest = None  # 最新一条数据的解析缓存，追加时失效
+        self._lock = threading.Lock()
+
+    def append_frame(self, timestamp: float, frame: bytes) -> None:
+        """
+        追加一帧原始遥测数据
 
-        self.callback = callback
-        self.telemetry = deque(maxlen=max_telemetry_size)
+        Args:
+            timestamp: 时间戳
+            frame: 32字节的原始数据
+        """
+        if not self.maxlen:
+            return
+
+        with self._lock:
+            i = self._next
+            offset = i * self.FRAME_SIZE
+            self._view[offset:offset + self.FRAME_SIZE] = frame
+            self._timestamps[i] = timestamp
+            self._latest = None
+            i += 1
+            self._next = 0 if i == self.maxlen else i
+            if self._count < self.maxlen:
+                self._count += 1
+
+    def append(self, telemetry: TelemetryData) -> None:
+        """
+        追加一条已解析的遥测数据
+        """
+        self.append_frame(telemetry.timestamp, telemetry.raw)
 
-        self.serial = serial.Serial(
-            port=self.port,
-            baudrate=self.baudrate,
-            bytesize=serial.EIGHTBITS,
-            parity=serial.PARITY_NONE,
-            stopbits=serial.STOPBITS_ONE,
-            timeout=timeout
-        )
-        self.serial.set_buffer_size(rx_size=rtx_buffer_size, tx_size=rtx_buffer_size)
-        self.serial.reset_input_buffer()
+    def clear(self) -> None:
+        with self._lock:
+            self._next = 0
+            self._count = 0
+            self._latest = None
 
-        self.thread_poll = ThreadPoolExecutor(max_workers=max_thread_poll_workers, thread_name_prefix="pyflywheel_")
+    def latest(self) -> Optional[TelemetryData]:
+        """
+        返回最新一条遥测数据，无数据时返回 None；
+        解析结果缓存至下一次追加，回调中反复读取时不重复解析
+        """
+        latest = self._latest
+        if latest is not None:
+            return latest
 
-    def __del__(self):
+        with self._lock:
+            if self._latest is None and self._count:
+                self._latest = self._decode(self._next - 1)
+            return self._latest
+
+    def snapshot(self) -> list:
         """
-        析构函数，确保资源正确释放
+        按时间顺序返回当前所有遥测数据
         """
-        self.disconnect()
+        with self._lock:
+            return [self._decode(slot) for slot in self._slots()]
 
-    def connect(self) -> bool:
+    def columns(self) -> dict:
         """
-        建立与飞轮的连接
+        按字段返回全部遥测数据，每列按时间顺序排列；对原始帧整体解包后转置，
+        不逐条构造 TelemetryData，适合绘图与统计
 
         Returns:
-            bool: 是否成功连接
-
-        Raises:
-            ConnectionError: 当连接失败时
+            dict: 字段名到数值元组的映射，包含 timestamp 与全部数值字段
         """
-        if self._is_connected:
-            self.logger.warning("飞轮已连接")
-            return True
+        names = TelemetryData._fields[1:-1]
+        size = self.FRAME_SIZE
+
+        with self._lock:
+            if not self._count:
+                return {name: () for name in ('timestamp',) + names}
+
+            start = (self._next - self._count) % self.maxlen
+            end = start + self._count
+            if end <= self.maxlen:
+                frames = self._view[start * size:end * size]
+                timestamps = self._timestamps[start:end]
+            else:
+                end -= self.maxlen
+                frames = self._view[start * size:].tobytes() + self._view[:end * size].tobytes()
+                timestamps = self._timestamps[start:] + self._timestamps[:end]
+            rows = self._FRAME_STRUCT.iter_unpack(frames)
 
-        try:
-            if not self.serial.is_open:
-                self.serial.open()
-            self._is_connected = True
-            return True
-        except Exception as e:
-            self.logger.error(f"串口连接失败: {str(e)}")
-            self._is_connected = False
-            return False
+            result = {'timestamp': tuple(timestamps)}
+            result.update(zip(names, zip(*rows)))
+            return result
 
-    def start(self):
-        """
-        启动飞轮通信和轮询
-        """
-        if self._running:
-            self.logger.warning("飞轮已启动")
-            return False
+    def _slots(self) -> range:
+        # 最旧数据所在位置起的 _count 个位置
+        start = self._next - self._count
+        return range(start, start + self._count)
 
-        self.logger.info("启动")
-        self._running = True
+    def _decode(self, slot: int) -> TelemetryData:
+        slot %= self.maxlen
+        offset = slot * self.FRAME_SIZE
+        return TelemetryData.from_frame(self._timestamps[slot], self._view[offset:offset + self.FRAME_SIZE])
 
-        # 启动通信线程
-        self._comm_thread = threading.Thread(target=self._communication_loop, daemon=True)
-        self._comm_thread.start()
-        self.logger.info(f"已启动通信线程, 频率: {self._communication_frequency}Hz")
+    def __len__(self) -> int:
+        return self._count
 
-        # 启动响应接收线程
-        self._resp_thread = threading.Thread(target=self._response_loop, daemon=True)
-        self._resp_thread.start()
-        self.logger.info(f"已启动响应接收线程, 频率: {self._communication_frequency}Hz")
+    def __bool__(self) -> bool:
+        return self._count > 0
 
-        # 启动响应处理线程
-        self._proc_resp_thread = threading.Thread(target=self._process_response, daemon=True)
-        self._proc_resp_thread.start()
-        self.logger.info(f"已启动响应处理线程")
+    def __getitem__(self, index: int) -> TelemetryData:
+        if index == -1 and self._count:
+            return self.latest()
 
-        # 如果设置了自动轮询，则启动轮询线程
-        if self.auto_polling:
-            if self._polling:
-                self.logger.warning("轮询线程已在运行")
-                return False
+        with self._lock:
+            if index < 0:
+                index += self._count
+            if not 0 <= index < self._count:
+                raise IndexError("遥测数据索引超出范围")
+            return self._decode(self._next - self._count + index)
 
-            self._polling = True
-            self._polling_thread = threading.Thread(target=self._polling_loop, daemon=True)
-            self._polling_thread.start()
-            self.logger.info(f"已启动轮询线程，频率: {self._polling_frequency}Hz")
+    def __iter__(self):
+        return iter(self.snapshot())
 
-        return True
 
-    def stop(self):
-        """
-        停止飞轮通信和轮询
-        """
-        self._running = False
-        self._polling = False
+class _FlyWheelBase:
+    """
+    飞轮协议基类，封装命令帧构建与遥测帧解析，通信方式由子类实现
+    """
+    # 基类不持有实例字典，子类可自行声明 __slots__
+    __slots__ = ()
+
+    # 帧头
+    _FRAME_HEADER = b'\xEB\x90'
 
-        # 哨兵
-        self.cmd_queue.put(None)
-        self.resp_queue.put(None)
-        self.serial.cancel_read()
-
-        # 等待所有线程结束
-        if self._comm_thread is not None:
-            self._comm_thread.join()
-        if self._resp_thread is not None:
-            self._resp_thread.join()
-        if self._polling_thread is not None:
-            self._polling_thread.join()
-        if self._proc_resp_thread is not None:
-            self._proc_resp_thread.join()
+    # 轮询命令包，内容固定
+    _POLL_COMMAND = b'\xEB\x90\xDD\x00\x00\x00\x00\xDD'
+
+    # 命令帧头(帧头 + 命令码)与大端float打包器
+    _CURRENT_PREFIX = bytes([0xEB, 0x90, 0xD1])
+    _SPEED_PREFIX = bytes([0xEB, 0x90, 0xD2])
+    _TORQUE_PREFIX = bytes([0xEB, 0x90, 0xD3])
+    _F32_BE = struct.Struct('>f')
+    # 命令包: 3字节帧头与命令码, 4字节数据, 1字节校验和
+    _COMMAND_STRUCT = struct.Struct('>3s4sB')
 
     def poll_status(self) -> bool:
         """
@@ -228,8 +313,7 @@ class FlyWheel:
         if not self._is_connected:
             raise ConnectionError("飞轮未连接")
 
-        command = bytes([0xEB, 0x90, 0xDD, 0x00, 0x00, 0x00, 0x00, 0xDD])
-        return self._send_command(command)
+        return self._send_command(self._POLL_COMMAND)
 
     def set_speed(self, speed: float) -> bool:
         """
@@ -244,7 +328,8 @@ class FlyWheel:
         Raises:
             ValueError: 当速度超出范围时
         """
-        if not -6050 <= speed <= 6050:
+        # 单次比较完成范围检查，写成 not ... <= 以保证 NaN 同样被拒绝
+        if not abs(speed) <= 6050:
             raise ValueError("速度必须在 -6050 到 +6050 RPM 之间")
 
         command = self._build_speed_command(speed)
@@ -264,7 +349,7 @@ class FlyWheel:
             ValueError: 当力矩超出范围时
         """
         # 验证力矩范围
-        if not -50 <= torque <= 50:
+        if not abs(torque) <= 50:
             raise ValueError("力矩必须在 -50 到 +50 mNm 之间")
 
         command = self._build_torque_command(torque)
@@ -283,7 +368,7 @@ class FlyWheel:
         Raises:
             ValueError: 当电流超出范围时
         """
-        if not -1500 <= current <= 1500:
+        if not abs(current) <= 1500:
             raise ValueError("电流必须在 -1500 到 +1500 mA 之间")
 
         command = self._build_current_command(current)
@@ -296,18 +381,8 @@ class FlyWheel:
         Args:
             speed: 目标转速
         """
-        header = bytes([0xEB, 0x90])
-        command_code = 0xD2
-
-        # 将速度转换为IEEE 754格式
-        speed_bytes = struct.pack('>f', float(speed))
-        # 高位在前，不用反转
-        speed_data = speed_bytes
-
-        # 计算校验和
-        checksum = (command_code + sum(speed_data)) & 0xFF
-
-        return header + bytes([command_code]) + speed_data + bytes([checksum])
+        # 将速度转换为IEEE 754格式，高位在前
+        return self._build_f32_command(self._SPEED_PREFIX, speed)
 
     def _build_torque_command(self, torque: float) -> bytes:
         """
@@ -319,16 +394,7 @@ class FlyWheel:
         Returns:
             bytes: 命令字节序列
         """
-        header = bytes([0xEB, 0x90])
-        command_code = 0xD3
-
-        # 将力矩转换为IEEE 754格式
-        torque_bytes = struct.pack('>f', float(torque))
-
-        # 计算校验和
-        checksum = (command_code + sum(torque_bytes)) & 0xFF
-
-        return header + bytes([command_code]) + torque_bytes + bytes([checksum])
+        return self._build_f32_command(self._TORQUE_PREFIX, torque)
 
     def _build_current_command(self, current: float) -> bytes:
         """
@@ -340,16 +406,39 @@ class FlyWheel:
         Returns:
             bytes: 命令字节序列
         """
-        header = bytes([0xEB, 0x90])
-        command_code = 0xD1
+        return self._build_f32_command(self._CURRENT_PREFIX, current)
 
-        # 将电流转换为IEEE 754格式
-        current_bytes = struct.pack('>f', float(current))
+    def _build_f32_command(self, prefix: bytes, value: float) -> bytes:
+        """
+        构建数据为单个float的命令包，速度、力矩、电流命令共用
 
-        # 计算校验和
-        checksum = (command_code + sum(current_bytes)) & 0xFF
+        Args:
+            prefix: 帧头与命令码
+            value: 命令数据
 
-        return header + bytes([command_code]) + current_bytes + bytes([checksum])
+        Returns:
+            bytes: 命令字节序列
+        """
+        return self._pack_command(prefix, self._F32_BE.pack(value))
+
+    @classmethod
+    @lru_cache(maxsize=512)
+    def _pack_command(cls, prefix: bytes, payload: bytes) -> bytes:
+        """
+        由命令帧头与4字节数据构建命令包。控制循环常反复下发相同的目标值，
+        结果以原始字节为键缓存，NaN 与 ±0 也能区分
+
+        Args:
+            prefix: 帧头与命令码
+            payload: 大端float数据
+
+        Returns:
+            bytes: 命令字节序列
+        """
+        # 校验和 = 命令码 + 4个数据字节，展开求和避免 sum() 的迭代开销
+        checksum = (prefix[2] + payload[0] + payload[1] + payload[2] + payload[3]) & 0xFF
+
+        return cls._COMMAND_STRUCT.pack(prefix, payload, checksum)
 
     def _process_data(self, data: bytes) -> TelemetryData:
         """
@@ -361,38 +450,292 @@ class FlyWheel:
         if len(data) != 32:
             raise ValueError("数据长度必须为32字节")
 
-        telemetry = TelemetryData(
-            timestamp=time.time(),
-            header='0x' + ' '.join([f'{x:02X}' for x in data[0:3]]),
-            last_command=f'0x{data[3]:02X}',
-            control_target=struct.unpack('>f', bytes(data[4:8]))[0],
-            flywheel_speed_feedback=struct.unpack('>f', bytes(data[8:12]))[0],
-            flywheel_current_feedback=struct.unpack('>f', bytes(data[12:16]))[0],
-            acceleration_feedback=struct.unpack('>f', bytes(data[16:20]))[0],
-            command_response_count=data[20],
-            telemetry_wheel_command_count=data[21],
-            error_command_count=data[22],
-            motherboard_current=int.from_bytes(data[23:25], byteorder='big'),
-            temperature=int.from_bytes(bytes([data[25]]), byteorder='big', signed=True),
-            single_motor_status=data[26],
-            reserved=data[27:31].hex(),
-            checksum=data[31]
+        return TelemetryData.from_frame(self._timestamp(), data)
+
+    def _timestamp(self, now: Optional[float] = None) -> float:
+        """
+        当前墙钟时间，由 perf_counter 的偏移换算
+
+        Args:
+            now: 已读取的 perf_counter 值，为空时重新读取
+        """
+        if now is None:
+            now = time.perf_counter()
+        return self._t0_wall + (now - self._t0_perf)
+
+    def _reset_clock(self) -> None:
+        """
+        记录墙钟与高精度计时器的对应关系，遥测时间戳由 perf_counter 的偏移换算得到
+        """
+        self._t0_wall = time.time()
+        self._t0_perf = time.perf_counter()
+
+    def _send_command(self, command: bytes) -> bool:
+        """
+        发送命令，由子类实现
+
+        Args:
+            command: 要发送的命令字节序列
+
+        Returns:
+            bool: 是否成功发送
+        """
+        raise NotImplementedError
+
+
+class FlyWheel(_FlyWheelBase):
+    """
+    飞轮控制类，负责与飞轮硬件通过RS232进行通信
+    """
+    # 接收缓冲区大小
+    _RX_BUFFER_SIZE = 8192
+    # 单次写入串口的最大命令数
+    _MAX_WRITE_BATCH = 8
+    # 停止时等待单个线程退出的最长时间，单位秒
+    _JOIN_TIMEOUT = 0.2
+    # 设定值命令码：电流、转速、力矩
+    _SETPOINT_CODES = frozenset((0xD1, 0xD2, 0xD3))
+    # Windows 串口驱动默认收发缓冲区大小，接收侧留足高频轮询时的余量
+    _DRIVER_RX_BUFFER_SIZE = 65536
+    _DRIVER_TX_BUFFER_SIZE = 8192
+    # 待执行回调事件的上限，与遥测数据存储数量无关
+    _CALLBACK_QUEUE_SIZE = 64
+
+    # 固定实例属性，属性访问走描述符而非实例字典
+    __slots__ = (
+        'inertia', 'port', 'baudrate', 'timeout', 'low_latency', 'logger',
+        'cmd_queue', '_queue_size', '_cmd_event', '_setpoint',
+        '_rx_buf', '_rx_view', '_rx_head', '_rx_tail',
+        '_communication_frequency', '_polling_frequency', '_comm_period', '_poll_period',
+        '_comm_thread', '_rx_thread', '_callback_thread',
+        'auto_polling', '_polling', '_running', '_is_connected', '_timer_resolution_set',
+        'callback', 'telemetry', '_callback_events', '_callback_event',
+        'serial', '_t0_wall', '_t0_perf', '__weakref__',
+    )
+
+    def __init__(self, port: str, baudrate: int, timeout: Optional[int] = None, inertia: float = 0.001608,
+                 queue_size: int = 1000, communication_frequency: int = 200,
+                 callback: Callable[[CallbackEvent], None] = None, max_telemetry_size: int = 1000,
+                 auto_polling: bool = False, polling_frequency: float = 100.0, rtx_buffer_size: Optional[int] = None,
+                 low_latency: bool = True, max_thread_poll_workers: Optional[int] = None):
+        """
+        初始化飞轮连接
+
+        Args:
+            port: RS232端口名称
+            baudrate: 波特率
+            timeout: 串口超时时间
+            queue_size: 通信队列大小
+            communication_frequency: 接收线程频率，仅在非阻塞串口(timeout=0)下生效
+            callback: 回调函数,接收遥测数据字典,可用于实时控制转速
+            max_telemetry_size: 遥测数据最大存储数量
+            auto_polling: 是否自动开启轮询
+            polling_frequency: 轮询频率，单位Hz
+            rtx_buffer_size: 串口驱动收发缓冲区大小，仅 Windows 下生效；
+                为空时接收缓冲区为 64 KiB，发送缓冲区为 8 KiB
+            low_latency: 连接时是否开启串口低延迟模式
+            max_thread_poll_workers: 已弃用，线程池已移除，该参数不再生效
+        """
+        if max_thread_poll_workers is not None:
+            warnings.warn("max_thread_poll_workers 已弃用，线程池已移除，该参数不再生效",
+                          DeprecationWarning, stacklevel=2)
+
+        self.inertia = inertia
+
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.low_latency = low_latency
+
+        self.logger = logging.getLogger(__name__)
+
+        # 命令通道：deque 的 append/popleft 在 CPython 中是原子操作，无需加锁；
+        # 队列由空变为非空时通过事件唤醒通信线程
+        self.cmd_queue = deque()
+        self._queue_size = queue_size
+        self._cmd_event = threading.Event()
+        # 设定值槽：电流/转速/力矩命令只保留最新一条，未发出的旧设定值直接被覆盖；
+        # maxlen=1 的 deque 追加与取出均为原子操作
+        self._setpoint = deque(maxlen=1)
+
+        # 接收环形缓冲区，head~tail 之间为未处理的数据
+        self._rx_buf = bytearray(self._RX_BUFFER_SIZE)
+        self._rx_view = memoryview(self._rx_buf)
+        self._rx_head = 0
+        self._rx_tail = 0
+
+        self._communication_frequency = communication_frequency
+        self._polling_frequency = polling_frequency
+        self._comm_period = 1.0 / communication_frequency
+        self._poll_period = 1.0 / polling_frequency
+
+        self._comm_thread = None
+        self._rx_thread = None
+        self._callback_thread = None
+
+        self.auto_polling = auto_polling
+
+        self._polling = False
+        self._running = False
+        self._is_connected = False
+        self._timer_resolution_set = False
+
+        self.callback = callback
+        self.telemetry = TelemetryBuffer(max_telemetry_size)
+        self._reset_clock()
+
+        # 回调事件通道：接收线程只登记事件，由回调线程按顺序调用回调，
+        # 回调耗时不会阻塞接收线程
+        self._callback_events = deque(maxlen=self._CALLBACK_QUEUE_SIZE)
+        self._callback_event = threading.Event()
+
+        self.serial = serial.Serial(
+            port=self.port,
+            baudrate=self.baudrate,
+            bytesize=serial.EIGHTBITS,
+            parity=serial.PARITY_NONE,
+            stopbits=serial.STOPBITS_ONE,
+            timeout=timeout
         )
+        # 仅 Windows 串口驱动支持设置收发缓冲区大小
+        set_buffer_size = getattr(self.serial, 'set_buffer_size', None)
+        if set_buffer_size is not None:
+            if rtx_buffer_size is None:
+                set_buffer_size(rx_size=self._DRIVER_RX_BUFFER_SIZE, tx_size=self._DRIVER_TX_BUFFER_SIZE)
+            else:
+                set_buffer_size(rx_size=rtx_buffer_size, tx_size=rtx_buffer_size)
+        self.serial.reset_input_buffer()
+
+    def __del__(self):
+        """
+        析构函数，确保资源正确释放
+        """
+        self.disconnect()
+
+    def connect(self) -> bool:
+        """
+        建立与飞轮的连接
 
-        return telemetry
+        Returns:
+            bool: 是否成功连接
+
+        Raises:
+            ConnectionError: 当连接失败时
+        """
+        if self._is_connected:
+            self.logger.warning("飞轮已连接")
+            return True
+
+        try:
+            if not self.serial.is_open:
+                self.serial.open()
+            if self.low_latency:
+                self._set_low_latency()
+            self._is_connected = True
+            return True
+        except serial.SerialException as e:
+            self.logger.error("串口连接失败: %s", e)
+            self._is_connected = False
+            return False
+
+    def _set_low_latency(self) -> None:
+        """
+        开启串口低延迟模式，Linux 下 USB 转串口驱动默认的 16ms 延迟定时器会拖慢每一帧；
+        平台或驱动不支持时保持默认设置
+        """
+        try:
+            self.serial.set_low_latency_mode(True)
+        except (AttributeError, NotImplementedError) as e:
+            # 非 Linux 平台不支持
+            self.logger.debug("当前平台不支持低延迟模式: %s", e)
+        except (ValueError, OSError) as e:
+            self.logger.warning("无法开启低延迟模式: %s", e)
+
+    def start(self):
+        """
+        启动飞轮通信和轮询
+        """
+        if self._running:
+            self.logger.warning("飞轮已启动")
+            return False
+
+        self.logger.info("启动")
+        self._running = True
+        self._reset_clock()
+        self._set_timer_resolution(True)
+
+        # 自动轮询由通信线程完成，需在启动通信线程前设置
+        self._polling = self.auto_polling
+        if self._polling:
+            self.logger.info("已开启轮询，频率: %sHz", self._polling_frequency)
+
+        # 启动通信线程
+        self._comm_thread = threading.Thread(target=self._communication_loop, name="pyflywheel-comm", daemon=True)
+        self._comm_thread.start()
+        self.logger.info("已启动通信线程")
+
+        # 启动接收线程，读取串口并分帧处理
+        self._rx_thread = threading.Thread(target=self._rx_loop, name="pyflywheel-rx", daemon=True)
+        self._rx_thread.start()
+        self.logger.info("已启动接收线程, 频率: %sHz", self._communication_frequency)
+
+        # 启动回调线程
+        self._callback_thread = threading.Thread(target=self._callback_loop, name="pyflywheel-callback", daemon=True)
+        self._callback_thread.start()
+
+        return True
+
+    def stop(self):
+        """
+        停止飞轮通信和轮询
+        """
+        self._running = False
+        self._polling = False
+
+        # 唤醒阻塞在事件与串口读取上的线程
+        self._cmd_event.set()
+        self._callback_event.set()
+        if self.serial is not None and self.serial.is_open:
+            self.serial.cancel_read()
+
+        # 等待所有线程结束，每个线程最多等待 _JOIN_TIMEOUT 秒，避免析构时卡住
+        current = threading.current_thread()
+        for thread in (self._comm_thread, self._rx_thread, self._callback_thread):
+            # 在回调中调用 stop() 时不能等待回调线程自身
+            if thread is None or thread is current:
+                continue
+            thread.join(self._JOIN_TIMEOUT)
+            if thread.is_alive():
+                self.logger.warning("线程未能及时退出: %s", thread.name)
+
+        self._set_timer_resolution(False)
+
+    def _set_timer_resolution(self, enable: bool) -> None:
+        """
+        Windows 默认计时器精度约 15.6ms，Event.wait 与 time.sleep 的超时会被取整到该精度，
+        100Hz 轮询会被拉长到 15.6ms 的整数倍；运行期间将系统计时器精度提高到 1ms，停止后恢复
+
+        Args:
+            enable: True 为提高精度，False 为恢复
+        """
+        if sys.platform != 'win32' or enable == self._timer_resolution_set:
+            return
+
+        try:
+            winmm = ctypes.WinDLL('winmm')
+            if enable:
+                winmm.timeBeginPeriod(1)
+            else:
+                winmm.timeEndPeriod(1)
+            self._timer_resolution_set = enable
+        except OSError as e:
+            self.logger.debug("无法设置系统计时器精度: %s", e)
 
     def disconnect(self):
         """
         断开与飞轮的连接
         """
-        self._running = False  # 这会终止所有线程
-        self._polling = False  # 为了明确性,也设置轮询标志
-
-        # 等待通信线程完成
-        if self._comm_thread is not None and self._comm_thread.is_alive():
-            self._comm_thread.join()
-        if self._polling_thread and self._polling_thread.is_alive():
-            self._polling_thread.join()
+        self.stop()
 
         if self.serial is not None and self.serial.is_open:
             self.serial.close()
@@ -404,209 +747,312 @@ class FlyWheel:
 
         Args:
             filename: 保存文件的路径
-            format: 保存格式，支持 'json' 或 'csv'
+            format: 保存格式，支持 'json'、'ndjson'(每行一条记录) 或 'csv'
 
         Returns:
             bool: 是否保存成功
         """
         try:
-            if format.lower() == 'json':
-                # 转换成可序列化的格式
-                telemetry_list = []
-                for data in self.telemetry:
-                    telemetry_list.append(data)
+            # 接收线程会并发追加数据，先取快照再遍历
+            records = self.telemetry.snapshot()
+            format = format.lower()
+
+            # 复用同一个编码器，省去每条记录 json.dumps 的参数处理；
+            # 字段均为ASCII，使用默认的 ensure_ascii 走更快的转义路径
+            encode = json.JSONEncoder().encode
 
+            if format == 'json':
+                # 逐条写出数组元素，每行一条记录，不构建完整的字典列表
                 with open(filename, 'w', encoding='utf-8') as f:
-                    json.dump(telemetry_list, f, indent=4, ensure_ascii=False)
+                    f.write('[')
+                    separator = '\n'
+                    for data in records:
+                        f.write(separator)
+                        f.write(encode(data.to_dict()))
+                        separator = ',\n'
+                    f.write('\n]\n')
+            elif format == 'ndjson':
+                # 逐条写出，不构建完整列表
+                with open(filename, 'w', encoding='utf-8') as f:
+                    for data in records:
+                        f.write(encode(data.to_dict()))
+                        f.write('\n')
+            elif format == 'csv':
+                with open(filename, 'w', encoding='utf-8', newline='') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(TelemetryData.EXPORT_FIELDS)
+                    writer.writerows(data.to_row() for data in records)
             else:
-                raise ValueError("不支持的格式，请使用 'json' 或 'csv'")
+                raise ValueError("不支持的格式，请使用 'json'、'ndjson' 或 'csv'")
 
-            self.logger.info(f"遥测数据已保存到 {filename}")
+            self.logger.info("遥测数据已保存到 %s", filename)
             return True
 
         except Exception as e:
-            self.logger.error(f"保存遥测数据失败: {str(e)}")
+            self.logger.error("保存遥测数据失败: %s", e)
             return False
 
     def _communication_loop(self) -> None:
         """
-        通信循环，只负责发送命令
+        通信循环，负责发送命令与定时轮询；将已排队的命令合并写入，轮询到期时附带轮询包，
+        无命令时阻塞等待命令队列或下一次轮询，发送速率由串口波特率限制
         """
-        period = 1.0 / self._communication_frequency
-        next_time = time.perf_counter() + period
+        poll_period = self._poll_period
+        next_poll = time.perf_counter() + poll_period
+
+        # 循环内用到的方法绑定为局部变量，省去每次的属性查找
+        pop_setpoint = self._setpoint.popleft
+        pop_command = self.cmd_queue.popleft
+        write = self.serial.write
+        perf_counter = time.perf_counter
+        max_batch = self._MAX_WRITE_BATCH
 
         while self._running:
             try:
                 if not self._is_connected:
                     time.sleep(1)
+                    next_poll = perf_counter() + poll_period  # 重置时间
                     continue
 
+                # 最新的设定值优先发送，再合并已排队的命令一次写入，限制批量大小以保证延迟有界
+                commands = []
                 try:
-                    command = self.cmd_queue.get()
-                except Empty:
+                    commands.append(pop_setpoint())
+                except IndexError:
+                    pass
+                while len(commands) < max_batch:
+                    try:
+                        commands.append(pop_command())
+                    except IndexError:
+                        break
+
+                # 轮询由本线程按绝对时间点直接发出，不经过命令队列；
+                # 超过一个周期未发出时以当前时间重新对齐，避免连续补发
+                timeout = None
+                if self._polling:
+                    now = perf_counter()
+                    if now >= next_poll:
+                        commands.append(self._POLL_COMMAND)
+                        next_poll += poll_period
+                        if next_poll <= now:
+                            next_poll = now + poll_period
+                    timeout = next_poll - now
+
+                if not commands:
+                    # 先清除事件再复查队列，避免与 _send_command 竞争时丢失唤醒
+                    self._cmd_event.clear()
+                    if not self.cmd_queue and not self._setpoint:
+                        self._cmd_event.wait(timeout)
                     continue
 
-                if not command:
-                    continue
+                command = commands[0] if len(commands) == 1 else b''.join(commands)
 
-                write_len = self.serial.write(command)
+                write_len = write(command)
 
                 if write_len != len(command):
-                    self.logger.error(f"发送命令失败: {command.hex()}")
-                    continue
-
-                next_time = self._wait_for_next_cycle(next_time, period)
+                    self.logger.error("发送命令失败: %s", command.hex())
 
             except Exception as e:
-                self.logger.exception(f"通信循环错误: {e}")
+                self.logger.exception("通信循环错误: %s", e)
 
-        print("通信线程退出")
+        self.logger.debug("通信线程退出")
 
-    def _response_loop(self) -> None:
+    def _rx_loop(self) -> None:
         """
-        响应处理循环，专门处理串口响应数据
+        接收循环，读取串口数据并直接在接收缓冲区中分帧处理；
+        阻塞读取时由串口驱动在数据到达时唤醒，仅非阻塞模式(timeout=0)按接收频率轮询
         """
-        period = 1.0 / self._communication_frequency  # 使用与通信相同的频率
+        period = self._comm_period
         next_time = time.perf_counter() + period
+        blocking = self.serial.timeout != 0
+
+        # 循环内用到的方法绑定为局部变量，省去每次的属性查找
+        readinto = self.serial.readinto
+        reserve = self._rx_reserve
+        wanted = self._rx_wanted
+        parse = self._rx_parse
+        perf_counter = time.perf_counter
 
         while self._running:
             try:
-                if not self._is_connected:
-                    next_time = self._wait_for_next_cycle(next_time, period)
-                    continue
-
-                response = self.serial.read(40)
-                if not response:
-                    next_time = self._wait_for_next_cycle(next_time, period)
-                    continue
-
-                self.resp_queue.put(response)
-
-                next_time = self._wait_for_next_cycle(next_time, period)
+                if self._is_connected:
+                    # 直接读入接收缓冲区尾部，不产生中间字节串
+                    n = readinto(reserve(wanted()))
+                    # 每次循环只读取一次时钟，同时用于遥测时间戳与周期调度
+                    now = perf_counter()
+                    if n:
+                        self._rx_tail += n
+                        parse(now)
+                    if blocking:
+                        continue
+                else:
+                    now = perf_counter()
 
             except Exception as e:
-                self.logger.exception(f"响应处理循环错误: {e}")
-                next_time = self._wait_for_next_cycle(next_time, period)
+                self.logger.exception("接收循环错误: %s", e)
+                self._rx_head = self._rx_tail = 0
+                now = perf_counter()
 
-        print("响应处理线程退出")
+            # 精确等待到下一个周期；超时时以当前时间重新对齐，避免连续补发
+            if next_time > now:
+                time.sleep(next_time - now)
+            else:
+                next_time = now
+            next_time += period
 
-    def _process_response(self) -> None:
+        self.logger.debug("接收线程退出")
+
+    def _callback_loop(self) -> None:
         """
-        处理响应数据，维护缓冲区处理字节串
+        回调循环，按接收顺序逐个调用回调函数
         """
-        buffer = bytearray()  # 用于存储未处理的字节数据
-        period = 1.0 / self._communication_frequency  # 使用与通信相同的频率
-        next_time = time.perf_counter() + period
+        events = self._callback_events
 
         while self._running:
             try:
-                if self.resp_queue.empty():
-                    next_time = self._wait_for_next_cycle(next_time, period)
-                    continue
-
-                chunk = self.resp_queue.get()
-                if not chunk:
-                    continue
-
-                # 如果chunk以0xEB开头，说明是帧头，清空buffer
-                if chunk[0] == 0xEB:
-                    buffer.clear()
-
-                # 将新数据添加到缓冲区
-                buffer.extend(chunk)
-
-                # 查找帧头位置
-                frame_start = buffer.find(bytes([0xEB, 0x90]))
-
-                # 如果没有找到帧头，继续等待下一帧
-                if frame_start == -1:
-                    continue
-
-                # 删除帧头之前的所有字节
-                if frame_start > 0:
-                    del buffer[:frame_start]
-
-                # 检查是否有足够数据判断帧长度
-                if len(buffer) < 3:
-                    continue
-
-                # 根据第三个字节判断帧长度
-                if buffer[2] == 0xDD:
-                    expected_length = 32
-                else:
-                    expected_length = 8
-
-                # 如果缓冲区数据不足，继续等待
-                if len(buffer) < expected_length:
-                    continue
-
-                # 提取完整帧
-                frame = buffer[:expected_length]
-                del buffer[:expected_length]  # 从缓冲区移除已处理的数据
-
-                # 计算校验和
-                checksum = sum(frame[2:-1]) & 0xFF
-                if checksum != frame[-1]:
-                    self.logger.warning(f"遥测数据校验和错误: {' '.join(f'{x:02X}' for x in frame)}")
-                    continue
-
-                # 处理帧数据
-                if expected_length == 32:
-                    try:
-                        telemetry = self._process_data(frame)
-                        if self.callback:
-                            self.thread_poll.submit(self.callback, CallbackEvent.RECV_TELE_DATA)
-                        self.telemetry.append(telemetry)
-                    except Exception as e:
-                        self.logger.error(f"处理遥测数据错误: {str(e)}")
-                else:
-                    self.logger.debug(f"收到8字节响应: {frame.hex()}")
-
+                event = events.popleft()
+            except IndexError:
+                # 先清除事件再复查队列，避免与接收线程竞争时丢失唤醒
+                self._callback_event.clear()
+                if not events:
+                    self._callback_event.wait()
+                continue
+
+            callback = self.callback
+            if callback is None:
+                continue
+            try:
+                callback(event)
             except Exception as e:
-                self.logger.error(f"处理响应数据时发生错误: {str(e)}")
-                buffer.clear()
+                self.logger.exception("回调函数错误: %s", e)
 
-        print("处理处理线程退出")
+    def _rx_wanted(self) -> int:
+        """
+        计算本次读取的字节数：恰好补齐缓冲区中未完成的帧，若驱动中已有更多数据则一并读出，
+        避免阻塞读取等待下一帧的字节
 
-    def _wait_for_next_cycle(self, next_time: float, period: float) -> float:
+        Returns:
+            int: 本次读取的字节数
         """
-        等待下一个周期
+        pending = self._rx_tail - self._rx_head
+        if pending >= 3 and self._rx_buf[self._rx_head + 2] == 0xDD:
+            frame_length = 32
+        else:
+            frame_length = 8
+        wanted = max(frame_length - pending, self.serial.in_waiting, 1)
+        return min(wanted, self._RX_BUFFER_SIZE // 2)
+
+    def _rx_reserve(self, size: int) -> memoryview:
         """
-        current_time = time.perf_counter()
-        sleep_time = next_time - current_time
-        if sleep_time > 0:
-            time.sleep(sleep_time)
-        next_time = next_time + period
+        确保接收缓冲区尾部有 size 字节空间，空间不足时先将未处理数据移到缓冲区开头
 
-        return next_time
+        Args:
+            size: 需要的字节数
 
-    def _polling_loop(self) -> None:
-        """
-        轮询循环，使用时间累加器确保固定频率
+        Returns:
+            memoryview: 缓冲区尾部 size 字节的视图
         """
-        period = 1.0 / self._polling_frequency  # 计算周期
-        next_time = time.perf_counter() + period  # 使用高精度计时器
+        if self._rx_tail + size > len(self._rx_buf):
+            self._rx_compact()
+        return self._rx_view[self._rx_tail:self._rx_tail + size]
 
-        while self._polling and self._running:
-            try:
-                if not self._is_connected:
-                    time.sleep(1)
-                    next_time = time.perf_counter() + period  # 重置时间
-                    continue
+    def _rx_append(self, chunk: bytes) -> None:
+        """
+        将字节串拷贝到接收缓冲区尾部
 
-                # 发送轮询命令
-                self.poll_status()
+        Args:
+            chunk: 接收到的字节串
+        """
+        n = len(chunk)
+        self._rx_reserve(n)[:] = chunk
+        self._rx_tail += n
 
-                # 精确等待到下一个周期
-                next_time = self._wait_for_next_cycle(next_time, period)
+    def _rx_compact(self) -> None:
+        """
+        将 head~tail 之间的未处理数据移到缓冲区开头
+        """
+        size = self._rx_tail - self._rx_head
+        self._rx_buf[:size] = self._rx_view[self._rx_head:self._rx_tail]
+        self._rx_head = 0
+        self._rx_tail = size
 
-            except Exception as e:
-                self.logger.error(f"轮询过程发生错误: {str(e)}")
+    def _rx_parse(self, now: Optional[float] = None) -> None:
+        """
+        从接收缓冲区中提取并处理所有完整帧，只移动 head 而不搬移数据
 
+        Args:
+            now: 本次数据到达时的 perf_counter 值，同一次读取中的帧共用该时间戳
+        """
+        timestamp = self._timestamp(now)
+        buf = self._rx_buf
+        view = self._rx_view
+        head = self._rx_head
+        tail = self._rx_tail
+
+        # 循环内用到的方法与常量绑定为局部变量，省去每帧的属性查找
+        find = buf.find
+        frame_header = self._FRAME_HEADER
+        adler32 = zlib.adler32
+
+        while True:
+            # 查找帧头位置
+            frame_start = find(frame_header, head, tail)
+
+            # 没有帧头时只保留最后一个字节，它可能是下一个帧头的首字节
+            if frame_start == -1:
+                if tail - head > 1:
+                    head = tail - 1
+                break
+            head = frame_start
+
+            # 检查是否有足够数据判断帧长度
+            if tail - head < 3:
+                break
+
+            # 根据第三个字节判断帧长度
+            expected_length = 32 if buf[head + 2] == 0xDD else 8
+
+            # 如果缓冲区数据不足，继续等待
+            if tail - head < expected_length:
+                break
+
+            frame_end = head + expected_length
+            frame = view[head:frame_end]
+
+            # 计算校验和：帧内字节和不超过 29*255 < 65521，adler32 的低16位即为字节和，
+            # 由 zlib 在C层直接对 memoryview 求和，无需拷贝与逐字节迭代
+            checksum = adler32(view[head + 2:frame_end - 1], 0) & 0xFF
+            head = frame_end
+            if checksum != buf[frame_end - 1]:
+                self.logger.warning("遥测数据校验和错误: %s", frame.hex(' ').upper())
+                continue
+
+            # 处理帧数据
+            if expected_length == 32:
+                try:
+                    # 只保存原始帧，读取时再解析
+                    self.telemetry.append_frame(timestamp, frame)
+                    if self.callback:
+                        self._callback_events.append(CallbackEvent.RECV_TELE_DATA)
+                        self._callback_event.set()
+                except Exception as e:
+                    self.logger.error("处理遥测数据错误: %s", e)
+            elif self.logger.isEnabledFor(logging.DEBUG):
+                # 应答随每条命令出现，未开启 DEBUG 时不生成十六进制字符串
+                self.logger.debug("收到8字节响应: %s", frame.hex())
+
+        if head == tail:
+            head = tail = 0
+        self._rx_head = head
+        self._rx_tail = tail
+
+        # 已处理数据超过一半时整体搬移一次
+        if head > len(buf) // 2:
+            self._rx_compact()
 
     def _send_command(self, command: bytes) -> bool:
         """
-        发送命令到队列
+        发送命令到队列；设定值命令只保留最新一条，不受队列容量限制
 
         Args:
             command: 要发送的命令字节序列
@@ -614,9 +1060,15 @@ class FlyWheel:
         Returns:
             bool: 是否成功发送
         """
-        try:
-            self.cmd_queue.put_nowait(command)
+        if command[2] in self._SETPOINT_CODES:
+            self._setpoint.append(command)
+            self._cmd_event.set()
             return True
-        except Full:
+
+        if len(self.cmd_queue) >= self._queue_size:
             self.logger.error("命令队列已满")
             return False
+
+        self.cmd_queue.append(command)
+        self._cmd_event.set()
+        return True
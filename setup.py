@@ -7,6 +7,9 @@ setup(
     install_requires=[
         # 在这里列出依赖包
     ],
+    extras_require={
+        "asyncio": ["pyserial-asyncio"],
+    },
     author="Xinyao Lun",
     author_email="xyaolun@163.com",
     description="A python module for FlyWheel experiment",
@@ -17,5 +20,5 @@ setup(
         "Programming Language :: Python :: 3",
         "Operating System :: OS Independent",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.8",
 ) 
\ No newline at end of file
@@ -0,0 +1,23 @@
+"""
+测试用遥测帧构造
+"""
+import struct
+
+
+def make_telemetry_frame(speed: float = 0.0, command_response_count: int = 0) -> bytes:
+    """
+    构造带正确校验和的32字节遥测帧
+
+    Args:
+        speed: 飞轮转速反馈
+        command_response_count: 命令应答计数
+
+    Returns:
+        bytes: 遥测帧
+    """
+    frame = bytearray(32)
+    frame[0:4] = [0xEB, 0x90, 0xDD, 0xD2]
+    frame[8:12] = struct.pack('>f', speed)
+    frame[20] = command_response_count
+    frame[31] = sum(frame[2:31]) & 0xFF
+    return bytes(frame)
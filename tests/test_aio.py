@@ -0,0 +1,214 @@
+"""
+飞轮异步控制模块测试套件
+"""
+import asyncio
+import threading
+import types
+import unittest
+from unittest.mock import Mock, patch
+
+from pyflywheel.aio import AsyncFlyWheel
+from pyflywheel.core import CallbackEvent
+from telemetry_frames import make_telemetry_frame
+
+
+class TestAsyncFlyWheel(unittest.IsolatedAsyncioTestCase):
+    """
+    异步飞轮控制类测试
+    """
+    async def asyncSetUp(self):
+        """
+        测试前准备，使用内存流代替串口
+        """
+        self.reader = asyncio.StreamReader()
+        self.writer = Mock()
+        # 仿照 pyserial-asyncio 的 SerialTransport，默认轮询间隔 0.5 ms
+        self.writer.transport = types.SimpleNamespace(_poll_wait_time=0.0005)
+        self.writer.drain = Mock(side_effect=lambda: asyncio.sleep(0))
+
+        async def fake_open(**kwargs):
+            return self.reader, self.writer
+
+        with patch('pyflywheel.aio.serial_asyncio.open_serial_connection', fake_open):
+            self.flywheel = AsyncFlyWheel(port='COM7', baudrate=115200)
+            self.assertTrue(await self.flywheel.connect())
+
+    async def asyncTearDown(self):
+        """
+        测试后清理
+        """
+        await self.flywheel.disconnect()
+
+    async def test_send_command(self):
+        """
+        测试命令经通信协程写入串口
+        """
+        await self.flywheel.start()
+        self.assertTrue(self.flywheel.set_speed(100.0))
+        await asyncio.sleep(0.01)
+        self.writer.write.assert_called_with(self.flywheel._build_speed_command(100.0))
+
+    async def test_receive_telemetry(self):
+        """
+        测试接收协程的帧同步与解析
+        """
+        callback = Mock()
+        self.flywheel.callback = callback
+        await self.flywheel.start()
+
+        # 帧前的噪声字节与校验和错误的帧都应被丢弃
+        bad_frame = bytearray(make_telemetry_frame(1.0))
+        bad_frame[31] ^= 0xFF
+        self.reader.feed_data(b'\x00\x01' + bytes(bad_frame) + make_telemetry_frame(500.0))
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(len(self.flywheel.telemetry), 1)
+        self.assertAlmostEqual(self.flywheel.telemetry[-1].flywheel_speed_feedback, 500.0)
+        callback.assert_called_once()
+
+    async def test_send_command_from_thread(self):
+        """
+        测试在其他线程中调用同步方法
+        """
+        await self.flywheel.start()
+        loop = asyncio.get_running_loop()
+        self.assertTrue(await loop.run_in_executor(None, self.flywheel.set_speed, 200.0))
+        await asyncio.sleep(0.01)
+        self.writer.write.assert_called_with(self.flywheel._build_speed_command(200.0))
+
+    async def test_coroutine_callback(self):
+        """
+        测试协程回调函数被等待执行
+        """
+        events = []
+
+        async def callback(event):
+            await asyncio.sleep(0)
+            events.append(event)
+
+        self.flywheel.callback = callback
+        await self.flywheel.start()
+        self.reader.feed_data(make_telemetry_frame(500.0))
+        await asyncio.sleep(0.01)
+        self.assertEqual(events, [CallbackEvent.RECV_TELE_DATA])
+
+    async def test_slow_coroutine_callback(self):
+        """
+        测试协程回调中的等待不阻塞接收
+        """
+        release = asyncio.Event()
+        events = []
+
+        async def callback(event):
+            await release.wait()
+            events.append(event)
+
+        self.flywheel.callback = callback
+        await self.flywheel.start()
+        for _ in range(3):
+            self.reader.feed_data(make_telemetry_frame(500.0))
+            await asyncio.sleep(0.01)
+        self.assertEqual(len(self.flywheel.telemetry), 3)
+        self.assertEqual(events, [])
+
+        release.set()
+        await asyncio.sleep(0.01)
+        self.assertEqual(events, [CallbackEvent.RECV_TELE_DATA] * 3)
+
+    async def test_poll_interval(self):
+        """
+        测试串口轮询间隔按波特率设置
+        """
+        self.assertAlmostEqual(self.flywheel.poll_interval, 80.0 / 115200)
+        self.assertEqual(self.writer.transport._poll_wait_time, self.flywheel.poll_interval)
+
+        # 传输对象没有该属性时不设置，仅记录日志
+        transport = types.SimpleNamespace()
+        writer = Mock(transport=transport)
+
+        async def fake_open(**kwargs):
+            return asyncio.StreamReader(), writer
+
+        flywheel = AsyncFlyWheel(port='COM7', baudrate=9600)
+        with patch('pyflywheel.aio.serial_asyncio.open_serial_connection', fake_open), \
+                self.assertLogs('pyflywheel.aio', level='DEBUG'):
+            self.assertTrue(await flywheel.connect())
+        self.assertFalse(hasattr(transport, '_poll_wait_time'))
+        await flywheel.disconnect()
+
+    async def test_queue_full(self):
+        """
+        测试命令队列已满
+        """
+        self.flywheel.cmd_queue = asyncio.Queue(maxsize=1)
+        self.assertTrue(self.flywheel.set_torque(10.0))
+        self.assertFalse(self.flywheel.set_torque(10.0))
+
+
+class TestAsyncFlyWheelIdleLoop(unittest.TestCase):
+    """
+    事件循环未运行时的同步调用测试
+    """
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+        async def fake_open(**kwargs):
+            return asyncio.StreamReader(), Mock()
+
+        with patch('pyflywheel.aio.serial_asyncio.open_serial_connection', fake_open):
+            self.flywheel = AsyncFlyWheel(port='COM7', baudrate=115200)
+            self.assertTrue(self.loop.run_until_complete(self.flywheel.connect()))
+
+    def tearDown(self):
+        if not self.loop.is_closed():
+            self.loop.run_until_complete(self.flywheel.disconnect())
+            self.loop.close()
+
+    def test_send_command_idle_loop(self):
+        """
+        测试事件循环空闲时在同一线程及其他线程中调用不会阻塞
+        """
+        self.assertTrue(self.flywheel.set_speed(10.0))
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(self.flywheel.set_speed(20.0)), daemon=True)
+        thread.start()
+        thread.join(timeout=1)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(results, [True])
+        self.assertEqual(self.flywheel.cmd_queue.qsize(), 2)
+
+    def test_send_command_handoff_timeout(self):
+        """
+        测试事件循环在其他线程中阻塞时超时返回 False，且命令未入队
+        """
+        blocked = threading.Event()
+        release = threading.Event()
+
+        def block():
+            blocked.set()
+            release.wait(timeout=1)
+
+        thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        thread.start()
+        self.loop.call_soon_threadsafe(block)
+        self.assertTrue(blocked.wait(timeout=1))
+        with patch.object(AsyncFlyWheel, '_HANDOFF_TIMEOUT', 0.05):
+            self.assertFalse(self.flywheel.set_speed(10.0))
+
+        release.set()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        thread.join(timeout=1)
+        self.assertEqual(self.flywheel.cmd_queue.qsize(), 0)
+
+    def test_send_command_closed_loop(self):
+        """
+        测试事件循环已关闭时返回 False
+        """
+        self.loop.run_until_complete(self.flywheel.disconnect())
+        self.loop.close()
+        self.assertFalse(self.flywheel.set_speed(10.0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,11 +1,19 @@
 """
 飞轮控制模块测试套件
 """
+import contextlib
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, PropertyMock, patch
 import struct
-from pyflywheel.core import FlyWheel
-import queue
+import csv
+import json
+import os
+import tempfile
+import threading
+import time
+import serial
+from pyflywheel.core import CallbackEvent, FlyWheel, TelemetryBuffer
+from telemetry_frames import make_telemetry_frame
 
 
 class TestFlyWheel(unittest.TestCase):
@@ -38,6 +46,32 @@ class TestFlyWheel(unittest.TestCase):
         # 停止mock
         self.mock_serial_patcher.stop()
         
+    @contextlib.contextmanager
+    def _running_loop(self, target, wakeup: threading.Event):
+        """
+        在线程中运行循环，退出时停止循环并确认线程及时结束
+
+        Args:
+            target: 循环方法
+            wakeup: 停止时用于唤醒循环的事件
+        """
+        self.flywheel._running = True
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        try:
+            yield
+        finally:
+            self.flywheel._running = False
+            wakeup.set()
+            thread.join(timeout=1)
+        self.assertFalse(thread.is_alive())
+
+    def _communication_running(self):
+        """
+        在线程中运行通信循环
+        """
+        return self._running_loop(self.flywheel._communication_loop, self.flywheel._cmd_event)
+
     def test_init(self):
         """
         测试初始化参数
@@ -50,7 +84,15 @@ class TestFlyWheel(unittest.TestCase):
             stopbits=1,
             timeout=1
         )
-        
+
+    def test_slots(self):
+        """
+        测试实例不持有属性字典
+        """
+        self.assertFalse(hasattr(self.flywheel, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.flywheel.unknown_attribute = 1
+
     def test_connect(self):
         """
         测试连接功能
@@ -65,7 +107,80 @@ class TestFlyWheel(unittest.TestCase):
         self.assertTrue(result)
         self.assertTrue(self.flywheel._is_connected)
         self.flywheel.serial.open.assert_called_once()
-        
+
+    def test_connect_failure(self):
+        """
+        测试串口打开失败
+        """
+        self.flywheel.disconnect()
+        self.flywheel.serial.is_open = False
+        self.flywheel.serial.open = Mock(side_effect=serial.SerialException("could not open port"))
+        self.assertFalse(self.flywheel.connect())
+        self.assertFalse(self.flywheel._is_connected)
+
+        # 串口已打开时不再重复打开
+        self.flywheel.serial.is_open = True
+        self.flywheel.serial.open.reset_mock()
+        self.assertTrue(self.flywheel.connect())
+        self.flywheel.serial.open.assert_not_called()
+
+    def test_init_deprecated_workers(self):
+        """
+        测试已弃用的线程池参数仍被接受并给出警告
+        """
+        with self.assertWarns(DeprecationWarning):
+            flywheel = FlyWheel(port='COM7', baudrate=115200, max_thread_poll_workers=2)
+        flywheel.disconnect()
+
+    def test_init_buffer_size(self):
+        """
+        测试串口驱动收发缓冲区大小
+        """
+        self.flywheel.serial.set_buffer_size.assert_called_once_with(rx_size=65536, tx_size=8192)
+
+        flywheel = FlyWheel(port='COM7', baudrate=115200, rtx_buffer_size=4096)
+        flywheel.serial.set_buffer_size.assert_called_with(rx_size=4096, tx_size=4096)
+        flywheel.disconnect()
+
+    def test_init_without_buffer_size(self):
+        """
+        测试串口驱动不支持设置缓冲区大小时(如 Linux)仍可初始化
+        """
+        mock_port = Mock(is_open=False)
+        del mock_port.set_buffer_size
+        self.mock_serial.return_value = mock_port
+        flywheel = FlyWheel(port='/dev/ttyUSB0', baudrate=115200)
+        flywheel.serial.reset_input_buffer.assert_called_once()
+        flywheel.disconnect()
+
+    def test_connect_low_latency(self):
+        """
+        测试连接时按参数开启低延迟模式
+        """
+        self.flywheel.serial.set_low_latency_mode.assert_called_once_with(True)
+
+        # 模拟串口的实例在各飞轮对象间共享
+        self.flywheel.serial.set_low_latency_mode.reset_mock()
+        flywheel = FlyWheel(port='COM7', baudrate=115200, low_latency=False)
+        flywheel.serial.is_open = True
+        self.assertTrue(flywheel.connect())
+        flywheel.serial.set_low_latency_mode.assert_not_called()
+        flywheel.disconnect()
+
+    def test_timer_resolution(self):
+        """
+        测试 Windows 下运行期间提高系统计时器精度，停止后恢复
+        """
+        winmm = Mock()
+        with patch('pyflywheel.core.sys.platform', 'win32'), \
+                patch('pyflywheel.core.ctypes.WinDLL', Mock(return_value=winmm), create=True):
+            self.flywheel._set_timer_resolution(True)
+            self.flywheel._set_timer_resolution(True)
+            winmm.timeBeginPeriod.assert_called_once_with(1)
+
+            self.flywheel._set_timer_resolution(False)
+            winmm.timeEndPeriod.assert_called_once_with(1)
+
     def test_build_speed_command(self):
         """
         测试速度命令构建
@@ -94,17 +209,78 @@ class TestFlyWheel(unittest.TestCase):
         result = self.flywheel.set_speed(100.0)
         self.assertTrue(result)
         
-    def test_set_speed_failure(self):
+    def test_set_speed_queue_full(self):
         """
-        测试设置速度失败情况
+        测试命令队列已满时设定值仍可下发，且只保留最新一条
         """
         # 模拟队列已满
-        self.flywheel.cmd_queue.put = Mock(side_effect=queue.Full)
+        self.flywheel.cmd_queue.extend([bytes(8)] * self.flywheel._queue_size)
 
-        # 测试设置速度
-        result = self.flywheel.set_speed(100.0)
-        self.assertFalse(result)
+        self.assertTrue(self.flywheel.set_speed(100.0))
+        self.assertTrue(self.flywheel.set_torque(10.0))
+        self.assertTrue(self.flywheel.set_speed(200.0))
+        self.assertEqual(list(self.flywheel._setpoint), [self.flywheel._build_speed_command(200.0)])
         
+    def test_communication_loop(self):
+        """
+        测试通信线程被命令唤醒并写入串口，停止时及时退出
+        """
+        written = threading.Event()
+        self.flywheel.serial.write = Mock(side_effect=lambda command: written.set() or len(command))
+        with self._communication_running():
+            self.assertTrue(self.flywheel.set_speed(100.0))
+            self.assertTrue(written.wait(timeout=1))
+        self.flywheel.serial.write.assert_called_once_with(self.flywheel._build_speed_command(100.0))
+
+    def test_communication_loop_setpoint(self):
+        """
+        测试未发出的旧设定值被覆盖，最新设定值先于排队的命令发送
+        """
+        written = threading.Event()
+        self.flywheel.serial.write = Mock(side_effect=lambda command: written.set() or len(command))
+        self.assertTrue(self.flywheel.poll_status())
+        self.assertTrue(self.flywheel.set_speed(100.0))
+        self.assertTrue(self.flywheel.set_current(50.0))
+
+        with self._communication_running():
+            self.assertTrue(written.wait(timeout=1))
+
+        self.flywheel.serial.write.assert_called_once_with(
+            self.flywheel._build_current_command(50.0) + bytes.fromhex('EB90DD00000000DD'))
+
+    def test_communication_loop_batch(self):
+        """
+        测试已排队的命令合并为一次写入，且单次写入的命令数有上限
+        """
+        self.flywheel.serial.write = Mock(side_effect=len)
+        commands = [self.flywheel._build_speed_command(i) for i in range(10)]
+        self.flywheel.cmd_queue.extend(commands)
+
+        with self._communication_running():
+            deadline = time.time() + 1
+            while self.flywheel.serial.write.call_count < 2 and time.time() < deadline:
+                time.sleep(0.01)
+
+        batch = self.flywheel._MAX_WRITE_BATCH
+        self.assertEqual(self.flywheel.serial.write.call_args_list[0].args[0], b''.join(commands[:batch]))
+        self.assertEqual(self.flywheel.serial.write.call_args_list[1].args[0], b''.join(commands[batch:]))
+
+    def test_communication_loop_polling(self):
+        """
+        测试通信线程按轮询频率直接发出轮询包，不经过命令队列
+        """
+        polls = []
+        self.flywheel.serial.write = Mock(side_effect=lambda command: polls.append(command) or len(command))
+        self.flywheel._poll_period = 0.01
+        self.flywheel._polling = True
+        with self._communication_running():
+            time.sleep(0.1)
+
+        self.assertGreaterEqual(len(polls), 5)
+        self.assertLessEqual(len(polls), 11)
+        self.assertTrue(all(command == bytes.fromhex('EB90DD00000000DD') for command in polls))
+        self.assertEqual(len(self.flywheel.cmd_queue), 0)
+
     def test_speed_limits(self):
         """
         测试速度限制
@@ -117,7 +293,10 @@ class TestFlyWheel(unittest.TestCase):
         with self.assertRaises(ValueError) as context:
             self.flywheel.set_speed(-7000)
         self.assertEqual(str(context.exception), "速度必须在 -6050 到 +6050 RPM 之间")
-            
+
+        with self.assertRaises(ValueError):
+            self.flywheel.set_speed(float('nan'))
+
         # 测试边界值
         try:
             # 测试最大速度
@@ -135,13 +314,14 @@ class TestFlyWheel(unittest.TestCase):
         """
         status = self.flywheel.poll_status()
         self.assertTrue(status)
+        self.assertEqual(self.flywheel.cmd_queue.popleft(), bytes.fromhex('EB90DD00000000DD'))
             
     def test_poll_status_failure(self):
         """
         测试状态轮询
         """
         # 模拟队列已满
-        self.flywheel.cmd_queue.put = Mock(side_effect=queue.Full)
+        self.flywheel.cmd_queue.extend([bytes(8)] * self.flywheel._queue_size)
 
         status = self.flywheel.poll_status()
         self.assertFalse(status)
@@ -164,7 +344,180 @@ class TestFlyWheel(unittest.TestCase):
         # 验证结果
         self.assertEqual(result.header, '0xEB 90 DD')
         self.assertAlmostEqual(result.flywheel_speed_feedback, 100.0)
-        
+        self.assertEqual(self.flywheel._process_data(bytes(32)).header, '0x00 00 00')
+
+    def test_process_data_fields(self):
+        """
+        测试遥测数据全部字段解析
+        """
+        test_data = bytearray(32)
+        test_data[0:4] = [0xEB, 0x90, 0xDD, 0xD2]
+        test_data[4:20] = struct.pack('>4f', 1000.0, 998.5, -120.25, 3.5)
+        test_data[20:23] = [7, 8, 9]
+        test_data[23:25] = (450).to_bytes(2, byteorder='big')
+        test_data[25] = 0xF6  # -10 摄氏度
+        test_data[26] = 0x01
+        test_data[27:31] = [0x01, 0x02, 0x03, 0x04]
+        test_data[31] = sum(test_data[2:31]) & 0xFF
+
+        result = self.flywheel._process_data(test_data)
+
+        self.assertEqual(result.last_command, '0xD2')
+        self.assertAlmostEqual(result.control_target, 1000.0)
+        self.assertAlmostEqual(result.flywheel_speed_feedback, 998.5)
+        self.assertAlmostEqual(result.flywheel_current_feedback, -120.25)
+        self.assertAlmostEqual(result.acceleration_feedback, 3.5)
+        self.assertEqual(result.command_response_count, 7)
+        self.assertEqual(result.telemetry_wheel_command_count, 8)
+        self.assertEqual(result.error_command_count, 9)
+        self.assertEqual(result.motherboard_current, 450)
+        self.assertEqual(result.temperature, -10)
+        self.assertEqual(result.single_motor_status, 1)
+        self.assertEqual(result.reserved, '01020304')
+        self.assertEqual(result.checksum, test_data[31])
+        self.assertAlmostEqual(result.timestamp, time.time(), delta=1.0)
+
+        # 兼容字典形式的字段访问
+        self.assertEqual(result['temperature'], -10)
+        self.assertEqual(result['header'], '0xEB 90 DD')
+        self.assertEqual(result[0], result.timestamp)
+        with self.assertRaises(KeyError):
+            result['raw']
+
+    def test_rx_parse(self):
+        """
+        测试接收缓冲区的帧提取
+        """
+        frame = make_telemetry_frame(100.0)
+        ack = self.flywheel._build_speed_command(100.0)
+
+        # 帧前噪声、跨块的帧、同一块中的多个帧
+        stream = b'\x00\x12' + frame + ack + frame + frame
+        for i in range(0, len(stream), 40):
+            self.flywheel._rx_append(stream[i:i + 40])
+            self.flywheel._rx_parse()
+
+        self.assertEqual(len(self.flywheel.telemetry), 3)
+        self.assertAlmostEqual(self.flywheel.telemetry[-1].flywheel_speed_feedback, 100.0)
+        self.assertEqual(self.flywheel._rx_head, self.flywheel._rx_tail)
+
+        # 校验和错误的帧被丢弃
+        bad_frame = bytearray(frame)
+        bad_frame[31] ^= 0xFF
+        self.flywheel._rx_append(bytes(bad_frame))
+        self.flywheel._rx_parse()
+        self.assertEqual(len(self.flywheel.telemetry), 3)
+
+    def test_callback_loop(self):
+        """
+        测试回调在回调线程中按顺序执行，慢回调不阻塞接收
+        """
+        frame = make_telemetry_frame()
+
+        release = threading.Event()
+        events = []
+
+        def slow_callback(event):
+            release.wait(timeout=1)
+            events.append(event)
+
+        self.flywheel.callback = slow_callback
+        with self._running_loop(self.flywheel._callback_loop, self.flywheel._callback_event):
+            # 回调阻塞期间接收仍可继续
+            self.flywheel._rx_append(frame * 3)
+            self.flywheel._rx_parse()
+            self.assertEqual(len(self.flywheel.telemetry), 3)
+
+            release.set()
+            deadline = time.time() + 1
+            while len(events) < 3 and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertEqual(events, [CallbackEvent.RECV_TELE_DATA] * 3)
+
+    def test_callback_without_telemetry_storage(self):
+        """
+        测试不存储遥测数据时回调仍被调用
+        """
+        frame = make_telemetry_frame()
+
+        flywheel = FlyWheel(port='COM7', baudrate=115200, max_telemetry_size=0, callback=Mock())
+        flywheel._rx_append(frame)
+        flywheel._rx_parse()
+        self.assertEqual(len(flywheel.telemetry), 0)
+        self.assertEqual(list(flywheel._callback_events), [CallbackEvent.RECV_TELE_DATA])
+        flywheel.disconnect()
+
+    def test_rx_loop(self):
+        """
+        测试接收线程直接从串口读取并分帧
+        """
+        # 数据区中的0xEB恰好位于块的开头，不应被当作帧头而丢弃前半帧
+        frame = make_telemetry_frame(command_response_count=0xEB)
+        chunks = [frame[:20], frame[20:], b'']
+        sizes = []
+
+        def fake_readinto(buffer):
+            if len(chunks) == 1:
+                self.flywheel._running = False
+            sizes.append(len(buffer))
+            chunk = chunks.pop(0)
+            buffer[:len(chunk)] = chunk
+            return len(chunk)
+
+        # 首次读取时驱动中已有20字节，之后只补齐未完成的帧
+        type(self.flywheel.serial).in_waiting = PropertyMock(side_effect=[20, 0, 0])
+        self.flywheel.serial.readinto = Mock(side_effect=fake_readinto)
+        self.flywheel.serial.timeout = None
+        self.flywheel._running = True
+        # 阻塞读取时不按周期等待
+        with patch('pyflywheel.core.time.sleep') as mock_sleep:
+            self.flywheel._rx_loop()
+        mock_sleep.assert_not_called()
+
+        self.assertEqual(sizes, [20, 12, 8])
+        self.assertEqual(len(self.flywheel.telemetry), 1)
+        self.assertEqual(self.flywheel.telemetry[-1].command_response_count, 0xEB)
+
+    def test_save_telemetry(self):
+        """
+        测试保存遥测数据
+        """
+        frame = make_telemetry_frame(100.0)
+        self.flywheel.telemetry.append_frame(1.0, frame)
+        self.flywheel.telemetry.append(self.flywheel._process_data(frame))
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, 'telemetry.json')
+            self.assertTrue(self.flywheel.save_telemetry(filename))
+            with open(filename, encoding='utf-8') as f:
+                records = json.load(f)
+            self.assertEqual(len(records), 2)
+            self.assertEqual(records[0]['header'], '0xEB 90 DD')
+            self.assertAlmostEqual(records[0]['flywheel_speed_feedback'], 100.0)
+
+            filename = os.path.join(tmpdir, 'telemetry.ndjson')
+            self.assertTrue(self.flywheel.save_telemetry(filename, format='ndjson'))
+            with open(filename, encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual(len(records), 2)
+            self.assertEqual(records[1]['last_command'], '0xD2')
+
+            filename = os.path.join(tmpdir, 'telemetry.csv')
+            self.assertTrue(self.flywheel.save_telemetry(filename, format='csv'))
+            with open(filename, encoding='utf-8', newline='') as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 2)
+            self.assertEqual(float(rows[0]['flywheel_speed_feedback']), 100.0)
+
+            self.assertFalse(self.flywheel.save_telemetry(filename, format='xml'))
+
+            # 无数据时输出空数组
+            self.flywheel.telemetry.clear()
+            filename = os.path.join(tmpdir, 'empty.json')
+            self.assertTrue(self.flywheel.save_telemetry(filename))
+            with open(filename, encoding='utf-8') as f:
+                self.assertEqual(json.load(f), [])
+
     def test_disconnect(self):
         """
         测试断开连接
@@ -173,7 +526,26 @@ class TestFlyWheel(unittest.TestCase):
         self.flywheel.disconnect()
         self.flywheel.serial.close.assert_called_once()
         self.assertFalse(self.flywheel._is_connected)
-        
+
+    def test_disconnect_running(self):
+        """
+        测试运行中断开连接时唤醒阻塞的线程并及时退出
+        """
+        cancelled = threading.Event()
+        self.flywheel.serial.is_open = True
+        self.flywheel.serial.in_waiting = 0
+        self.flywheel.serial.cancel_read = Mock(side_effect=cancelled.set)
+        # 模拟无数据时阻塞读取，直到 cancel_read 被调用
+        self.flywheel.serial.readinto = Mock(side_effect=lambda buffer: cancelled.wait(timeout=5) and 0)
+        self.flywheel.auto_polling = True
+        self.flywheel.start()
+
+        start = time.perf_counter()
+        self.flywheel.disconnect()
+        self.assertLess(time.perf_counter() - start, 0.5)
+        for thread in (self.flywheel._comm_thread, self.flywheel._rx_thread, self.flywheel._callback_thread):
+            self.assertFalse(thread.is_alive())
+
     def test_build_torque_command(self):
         """
         测试力矩命令构建
@@ -202,6 +574,24 @@ class TestFlyWheel(unittest.TestCase):
         command = self.flywheel._build_torque_command(-30.0)
         self.assertEqual(command, bytes.fromhex('EB90D3C1F0000084'))
         
+    def test_build_current_command(self):
+        """
+        测试电流命令构建
+        """
+        command = self.flywheel._build_current_command(100.0)
+        self.assertEqual(command, bytes.fromhex('EB90D142C80000DB'))
+
+        command = self.flywheel._build_current_command(-100.0)
+        self.assertEqual(command, bytes.fromhex('EB90D1C2C800005B'))
+
+    def test_build_command_cache(self):
+        """
+        测试命令包缓存按原始字节区分 +0 与 -0
+        """
+        self.assertIs(self.flywheel._build_speed_command(100.0), self.flywheel._build_speed_command(100.0))
+        self.assertEqual(self.flywheel._build_speed_command(0.0), bytes.fromhex('EB90D200000000D2'))
+        self.assertEqual(self.flywheel._build_speed_command(-0.0), bytes.fromhex('EB90D28000000052'))
+
     def test_set_torque_success(self):
         """
         测试正常设置力矩
@@ -210,16 +600,16 @@ class TestFlyWheel(unittest.TestCase):
         result = self.flywheel.set_torque(30.0)
         self.assertTrue(result)
         
-    def test_set_torque_failure(self):
+    def test_set_torque_queue_full(self):
         """
-        测试设置力矩失败情况
+        测试命令队列已满时仍可设置力矩
         """
         # 模拟队列已满
-        self.flywheel.cmd_queue.put = Mock(side_effect=queue.Full)
+        self.flywheel.cmd_queue.extend([bytes(8)] * self.flywheel._queue_size)
 
-        # 测试设置力矩
         result = self.flywheel.set_torque(30.0)
-        self.assertFalse(result)
+        self.assertTrue(result)
+        self.assertEqual(list(self.flywheel._setpoint), [self.flywheel._build_torque_command(30.0)])
         
     def test_torque_limits(self):
         """
@@ -246,5 +636,80 @@ class TestFlyWheel(unittest.TestCase):
             self.fail("合法力矩值引发了异常")
 
 
+class TestTelemetryBuffer(unittest.TestCase):
+    """
+    遥测数据环形缓冲区测试
+    """
+    def test_append_and_index(self):
+        """
+        测试追加与索引
+        """
+        buffer = TelemetryBuffer(maxlen=3)
+        self.assertEqual(len(buffer), 0)
+        self.assertFalse(buffer)
+        with self.assertRaises(IndexError):
+            buffer[-1]
+
+        buffer.append_frame(1.0, make_telemetry_frame(10.0))
+        buffer.append_frame(2.0, make_telemetry_frame(20.0))
+        self.assertEqual(len(buffer), 2)
+        self.assertEqual(buffer[0].timestamp, 1.0)
+        self.assertAlmostEqual(buffer[-1].flywheel_speed_feedback, 20.0)
+        self.assertEqual(buffer[-1].header, '0xEB 90 DD')
+
+    def test_overwrite_oldest(self):
+        """
+        测试写满后覆盖最旧数据
+        """
+        buffer = TelemetryBuffer(maxlen=3)
+        for i in range(5):
+            buffer.append_frame(float(i), make_telemetry_frame(i * 10.0))
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual([data.timestamp for data in buffer], [2.0, 3.0, 4.0])
+        self.assertAlmostEqual(buffer[0].flywheel_speed_feedback, 20.0)
+        self.assertAlmostEqual(buffer[-1].flywheel_speed_feedback, 40.0)
+        with self.assertRaises(IndexError):
+            buffer[3]
+
+        # 已解析的数据可以原样追加
+        oldest = buffer[0]
+        buffer.append(oldest)
+        self.assertEqual(buffer[-1], oldest)
+        self.assertEqual(buffer[0].timestamp, 3.0)
+
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        self.assertIsNone(buffer.latest())
+
+    def test_latest_cache(self):
+        """
+        测试最新数据的解析缓存在追加后失效
+        """
+        buffer = TelemetryBuffer(maxlen=2)
+        buffer.append_frame(1.0, make_telemetry_frame(10.0))
+        latest = buffer.latest()
+        self.assertIs(buffer[-1], latest)
+
+        buffer.append_frame(2.0, make_telemetry_frame(20.0))
+        self.assertIsNot(buffer.latest(), latest)
+        self.assertAlmostEqual(buffer[-1].flywheel_speed_feedback, 20.0)
+
+    def test_columns(self):
+        """
+        测试按列读取，环形缓冲区回绕后仍按时间顺序排列
+        """
+        buffer = TelemetryBuffer(maxlen=3)
+        self.assertEqual(buffer.columns()['flywheel_speed_feedback'], ())
+
+        for i in range(4):
+            buffer.append_frame(float(i), make_telemetry_frame(i * 10.0))
+
+        columns = buffer.columns()
+        self.assertEqual(columns['timestamp'], (1.0, 2.0, 3.0))
+        self.assertEqual(columns['flywheel_speed_feedback'], (10.0, 20.0, 30.0))
+        self.assertEqual(columns['checksum'], tuple(data.checksum for data in buffer))
+
+
 if __name__ == '__main__':
     unittest.main()